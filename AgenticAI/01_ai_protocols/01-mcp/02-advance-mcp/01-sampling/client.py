@@ -1,5 +1,6 @@
 import asyncio
-from anthropic import AsyncAnthropic
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.session import RequestContext
@@ -10,7 +11,16 @@ from mcp.types import (
     SamplingMessage,
 )
 
-anthropic_client = AsyncAnthropic()
+# The SDK's default pool, with idle connections to the Anthropic API kept for
+# 60 s instead of 5 s so sampling requests that arrive further apart reuse them
+http_client = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(
+        max_connections=1000,
+        max_keepalive_connections=100,
+        keepalive_expiry=60.0,
+    ),
+)
+anthropic_client = AsyncAnthropic(http_client=http_client)
 model = "claude-sonnet-4-0"
 
 server_params = StdioServerParameters(
@@ -20,26 +30,15 @@ server_params = StdioServerParameters(
 
 
 async def chat(input_messages: list[SamplingMessage], max_tokens=4000):
-    messages = []
     # The list of messages provided by the server are formatted for communication in MCP. The individual messages aren't guaranteed to be 
     # compatible with whatever LLM SDK you are using.
    # For example, if you're using the Anthropic SDK, you'll have to write a little 
    # bit of conversion logic to turn the MCP messages into a format compatible with Anthropic's SDK.
-    for msg in input_messages:
-        if msg.role == "user" and msg.content.type == "text":
-            content = (
-                msg.content.text
-                if hasattr(msg.content, "text")
-                else str(msg.content)
-            )
-            messages.append({"role": "user", "content": content})
-        elif msg.role == "assistant" and msg.content.type == "text":
-            content = (
-                msg.content.text
-                if hasattr(msg.content, "text")
-                else str(msg.content)
-            )
-            messages.append({"role": "assistant", "content": content})
+    messages = [
+        {"role": msg.role, "content": msg.content.text}
+        for msg in input_messages
+        if msg.role in ("user", "assistant") and msg.content.type == "text"
+    ]
 
     response = await anthropic_client.messages.create(
         model=model,
@@ -47,7 +46,7 @@ async def chat(input_messages: list[SamplingMessage], max_tokens=4000):
         max_tokens=max_tokens,
     )
 
-    text = "".join([p.text for p in response.content if p.type == "text"])
+    text = "".join(p.text for p in response.content if p.type == "text")
     return text
 
 # On the client, you must implement a sampling callback. It will receive a 
@@ -68,18 +67,21 @@ async def sampling_callback(
 
 
 async def run():
-    async with stdio_client(server_params) as (read, write):
-        # Don't forget: the callback on the client needs to be passed into the ClientSession call.
-        async with ClientSession(
-            read, write, sampling_callback=sampling_callback
-        ) as session:
-            await session.initialize()
+    try:
+        async with stdio_client(server_params) as (read, write):
+            # Don't forget: the callback on the client needs to be passed into the ClientSession call.
+            async with ClientSession(
+                read, write, sampling_callback=sampling_callback
+            ) as session:
+                await session.initialize()
 
-            result = await session.call_tool(
-                name="summarize",
-                arguments={"text_to_summarize": "lots of text"},
-            )
-            print(result.content)
+                result = await session.call_tool(
+                    name="summarize",
+                    arguments={"text_to_summarize": "lots of text"},
+                )
+                print(result.content)
+    finally:
+        await anthropic_client.close()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,28 @@
+import hashlib
+from collections import OrderedDict
+
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.types import SamplingMessage, TextContent
 
 mcp = FastMCP(name="Demo Server")
 
+# Summaries of recently seen texts, so summarizing the same text again
+# doesn't need another round trip to the client's language model.
+SUMMARY_CACHE_SIZE = 512
+summary_cache: OrderedDict[str, str] = OrderedDict()
+
+
+def _summary_key(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
 
 @mcp.tool()
 async def summarize(text_to_summarize: str, ctx: Context):
+    key = _summary_key(text_to_summarize)
+    if key in summary_cache:
+        summary_cache.move_to_end(key)
+        return summary_cache[key]
+
     prompt = f"""
         Please summarize the following text:
         {text_to_summarize}
@@ -28,6 +45,9 @@ async def summarize(text_to_summarize: str, ctx: Context):
     # Return the generated text
 
     if result.content.type == "text":
+        summary_cache[key] = result.content.text
+        if len(summary_cache) > SUMMARY_CACHE_SIZE:
+            summary_cache.popitem(last=False)
         return result.content.text
     else:
         raise ValueError("Sampling failed")
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+_client: Optional[AsyncAnthropic] = None
+
+
+def get_client() -> AsyncAnthropic:
+    """Returns the shared AsyncAnthropic client, creating it on first use.
+
+    All Claude instances share one client, and so one connection pool. The
+    SDK's pool drops idle connections after 5 s, less than a user takes to
+    type the next query; keeping them for 60 s lets the next turn skip the
+    TCP + TLS handshake. The SDK's other defaults are kept.
+    """
+    global _client
+    if _client is None:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=1000,
+                max_keepalive_connections=100,
+                keepalive_expiry=60.0,
+            ),
+        )
+        _client = AsyncAnthropic(http_client=http_client)
+    return _client
+
+
+async def close_client():
+    """Closes the shared client and its connection pool, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -1,33 +1,101 @@
-from anthropic import AsyncAnthropic
 from anthropic.types import Message
 
+from core.anthropic_singleton import get_client
+
+# Prompt caching
+# --------------
+# Anthropic caches everything in the prompt up to (and including) a block
+# marked with cache_control. The system prompt and the tool list are identical
+# on every turn, so marking them lets repeated turns skip re-processing them.
+# Long conversations are cached too, once the history is big enough to be
+# worth it (the API ignores cache markers on prompts below ~1024 tokens).
+CACHE_CONTROL = {"type": "ephemeral"}
+CACHE_MIN_MESSAGE_CHARS = 4096
+
+
+def _cached_system(system: str) -> list[dict]:
+    return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+
+def _cached_tools(tools: list[dict]) -> list[dict]:
+    return [*tools[:-1], {**tools[-1], "cache_control": CACHE_CONTROL}]
+
+
+def _text_length_reaches(messages: list, limit: int) -> bool:
+    """Whether the text in the messages adds up to `limit` characters.
+
+    A cheap size estimate: only text fields are counted, newest message first,
+    and counting stops as soon as the limit is reached.
+    """
+    total = 0
+    for message in reversed(messages):
+        content = message["content"]
+        if isinstance(content, str):
+            total += len(content)
+        else:
+            for block in content:
+                if isinstance(block, dict):
+                    text = block.get("text") or block.get("content")
+                else:
+                    text = getattr(block, "text", None)
+                if isinstance(text, str):
+                    total += len(text)
+        if total >= limit:
+            return True
+    return False
+
+
+def _cached_messages(messages: list) -> list:
+    """Marks the last message for caching when the history is long enough.
+
+    The stored history is left untouched; only the last message is copied.
+    """
+    if not messages or not _text_length_reaches(messages, CACHE_MIN_MESSAGE_CHARS):
+        return messages
+
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = [
+            block
+            if isinstance(block, dict)
+            else block.model_dump(exclude_none=True)
+            for block in content
+        ]
+    if not blocks:
+        return messages
+
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return [*messages[:-1], {**last, "content": blocks}]
+
 
 class Claude:
     def __init__(self, model: str):
-        self.client = AsyncAnthropic()
+        self.client = get_client()
         self.model = model
 
+    def _add_message(self, messages: list, role: str, message):
+        # Message isn't subclassed, so an identity check on the type is enough
+        messages.append(
+            {
+                "role": role,
+                "content": message.content
+                if type(message) is Message
+                else message,
+            }
+        )
+
     def add_user_message(self, messages: list, message):
-        user_message = {
-            "role": "user",
-            "content": message.content
-            if isinstance(message, Message)
-            else message,
-        }
-        messages.append(user_message)
+        self._add_message(messages, "user", message)
 
     def add_assistant_message(self, messages: list, message):
-        assistant_message = {
-            "role": "assistant",
-            "content": message.content
-            if isinstance(message, Message)
-            else message,
-        }
-        messages.append(assistant_message)
+        self._add_message(messages, "assistant", message)
 
     def text_from_message(self, message: Message):
         return "\n".join(
-            [block.text for block in message.content if block.type == "text"]
+            block.text for block in message.content if block.type == "text"
         )
 
     async def chat(
@@ -43,7 +111,7 @@ class Claude:
         params = {
             "model": self.model,
             "max_tokens": 8000,
-            "messages": messages,
+            "messages": _cached_messages(messages),
             "temperature": temperature,
             "stop_sequences": stop_sequences,
         }
@@ -55,10 +123,10 @@ class Claude:
             }
 
         if tools:
-            params["tools"] = tools
+            params["tools"] = _cached_tools(tools)
 
         if system:
-            params["system"] = system
+            params["system"] = _cached_system(system)
 
         message = await self.client.messages.create(**params)
         return message
@@ -77,7 +145,7 @@ class Claude:
         params = {
             "model": self.model,
             "max_tokens": 8000,
-            "messages": messages,
+            "messages": _cached_messages(messages),
             "temperature": temperature,
             "stop_sequences": stop_sequences,
         }
@@ -89,17 +157,16 @@ class Claude:
             }
 
         if tools:
-            params["tools"] = tools
+            params["tools"] = _cached_tools(tools)
 
         if system:
-            params["system"] = system
+            params["system"] = _cached_system(system)
 
         async with self.client.messages.stream(**params) as stream:
             if on_event:
                 async for event in stream:
                     await on_event(event)
-            else:
-                async for event in stream:
-                    pass
 
-        return await stream.get_final_message()
+            # Without a callback there's nothing to do per event; the SDK
+            # drains the stream itself while assembling the final message.
+            return await stream.get_final_message()
@@ -1,10 +1,45 @@
+import asyncio
+import sys
 from prompt_toolkit import PromptSession
 from prompt_toolkit.styles import Style
 from prompt_toolkit.history import InMemoryHistory
 from core.cli_chat import CliChat
-import json
 from pyboxen import boxen
 
+try:
+    import orjson
+
+    _parse_json = orjson.loads
+
+    def _format_json(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+    import json
+
+    _parse_json = json.loads
+    _format_json = json.JSONEncoder(indent=2).encode
+
+# Streamed text is written without flushing and flushed at most this often
+# (in seconds), instead of issuing one write syscall per token.
+STREAM_FLUSH_INTERVAL = 0.05
+
+_PROMPT_STYLE = Style.from_dict(
+    {
+        "prompt": "#aaaaaa",
+        "completion-menu.completion": "bg:#222222 #ffffff",
+        "completion-menu.completion.current": "bg:#444444 #ffffff",
+    }
+)
+
+# Tool call rendering settings, built once rather than per tool call
+_TOOL_BOX_STYLE = {
+    "title": "Tool Call",
+    "style": "rounded",
+    "color": "blue",
+    "padding": 0,
+}
+
 
 class CliApp:
     def __init__(self, agent: CliChat):
@@ -12,21 +47,74 @@ class CliApp:
         self.history = InMemoryHistory()
         self.session = PromptSession(
             history=self.history,
-            style=Style.from_dict(
-                {
-                    "prompt": "#aaaaaa",
-                    "completion-menu.completion": "bg:#222222 #ffffff",
-                    "completion-menu.completion.current": "bg:#444444 #ffffff",
-                }
-            ),
+            style=_PROMPT_STYLE,
             complete_while_typing=True,
             complete_in_thread=True,
         )
+        self._out = sys.stdout
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def _write(self, text: str):
+        self._out.write(text)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                STREAM_FLUSH_INTERVAL, self._flush
+            )
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._out.flush()
+
+    def _on_block_delta(self, event, tool_calls: dict):
+        delta_type = getattr(event.delta, "type", None)
+        if delta_type == "text_delta":
+            self._write(event.delta.text)
+        elif delta_type == "input_json_delta":
+            # Track tool call arguments as they stream
+            if event.index not in tool_calls:
+                tool_calls[event.index] = {"name": "", "args": ""}
+            tool_calls[event.index]["args"] += event.delta.partial_json
+
+    def _on_block_start(self, event, tool_calls: dict):
+        if getattr(event.content_block, "type", None) == "tool_use":
+            print()  # New line before tool call
+            # Store tool name but don't print yet
+            tool_call = tool_calls.setdefault(
+                getattr(event, "index", 0), {"name": "", "args": ""}
+            )
+            tool_call["name"] = event.content_block.name
+
+    def _on_block_stop(self, event, tool_calls: dict):
+        self._flush()
+        tool_call = tool_calls.pop(event.index, None)
+        if tool_call is None:
+            return
+
+        tool_name = tool_call["name"]
+        args_json = tool_call["args"]
+
+        try:
+            parsed_args = _parse_json(args_json)
+            formatted_args = _format_json(parsed_args)
+            tool_content = f"🔧 {tool_name}\n\nArguments:\n{formatted_args}"
+        except (TypeError, ValueError):
+            tool_content = f"🔧 {tool_name}\n\nArguments: {args_json}"
+
+        print(boxen(tool_content, **_TOOL_BOX_STYLE))
 
     async def initialize(self):
         pass
 
     async def run(self):
+        # Streaming events are dispatched on their type with a single lookup
+        event_handlers = {
+            "content_block_delta": self._on_block_delta,
+            "content_block_start": self._on_block_start,
+            "content_block_stop": self._on_block_stop,
+        }
+
         while True:
             try:
                 user_input = await self.session.prompt_async("> ")
@@ -36,78 +124,18 @@ class CliApp:
                 print()
 
                 tool_calls = {}
-                response_text = ""
 
                 async def handle_event(event):
-                    nonlocal response_text
-                    if hasattr(event, "type"):
-                        if event.type == "content_block_delta":
-                            if hasattr(event, "delta") and hasattr(
-                                event.delta, "type"
-                            ):
-                                if event.delta.type == "text_delta":
-                                    response_text += event.delta.text
-                                    print(event.delta.text, end="", flush=True)
-                                elif event.delta.type == "input_json_delta":
-                                    # Track tool call arguments as they stream
-                                    index = event.index
-                                    if index not in tool_calls:
-                                        tool_calls[index] = {
-                                            "name": "",
-                                            "args": "",
-                                        }
-                                    tool_calls[index]["args"] += (
-                                        event.delta.partial_json
-                                    )
-                        elif event.type == "content_block_start":
-                            if hasattr(event, "content_block") and hasattr(
-                                event.content_block, "type"
-                            ):
-                                if event.content_block.type == "tool_use":
-                                    print()  # New line before tool call
-                                    # Store tool name but don't print yet
-                                    index = getattr(event, "index", 0)
-                                    if index not in tool_calls:
-                                        tool_calls[index] = {
-                                            "name": "",
-                                            "args": "",
-                                        }
-                                    tool_calls[index]["name"] = (
-                                        event.content_block.name
-                                    )
-                        elif event.type == "content_block_stop":
-                            if event.index in tool_calls:
-                                tool_name = tool_calls[event.index]["name"]
-                                args_json = tool_calls[event.index]["args"]
-
-                                try:
-                                    parsed_args = json.loads(args_json)
-                                    formatted_args = json.dumps(
-                                        parsed_args, indent=2
-                                    )
-                                    tool_content = f"🔧 {tool_name}\n\nArguments:\n{formatted_args}"
-                                except (
-                                    json.JSONDecodeError,
-                                    TypeError,
-                                    ValueError,
-                                ):
-                                    tool_content = f"🔧 {tool_name}\n\nArguments: {args_json}"
-
-                                tool_box = boxen(
-                                    tool_content,
-                                    title="Tool Call",
-                                    style="rounded",
-                                    color="blue",
-                                    padding=0,
-                                )
-                                print(tool_box)
-                                del tool_calls[event.index]
+                    handler = event_handlers.get(getattr(event, "type", None))
+                    if handler is not None:
+                        handler(event, tool_calls)
 
                 await self.agent.run(
                     user_input, stream=True, on_event=handle_event
                 )
 
                 print()  # Add newline after everything
+                self._flush()
 
             except KeyboardInterrupt:
                 break
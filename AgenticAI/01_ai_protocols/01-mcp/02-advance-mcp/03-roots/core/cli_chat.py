@@ -1,5 +1,5 @@
 from typing import List
-from mcp.types import Prompt, PromptMessage
+from mcp.types import Prompt, PromptMessage, TextContent
 from anthropic.types import MessageParam
 
 from core.chat import Chat
@@ -30,46 +30,51 @@ class CliChat(Chat):
         self.messages.append({"role": "user", "content": query})
 
 
+_ROLES = {"user": "user", "assistant": "assistant"}
+
+
+def _dict_text(content: dict) -> str | None:
+    return content.get("text", "") if content.get("type") == "text" else None
+
+
+# Prompt content is almost always a TextContent model or a plain dict, so
+# look those up by exact type instead of probing attributes on every block.
+_TEXT_HANDLERS = {
+    TextContent: lambda content: content.text,
+    dict: _dict_text,
+}
+
+
+def _text_of(content) -> str | None:
+    """Returns the text of a text content block, or None for other blocks."""
+    handler = _TEXT_HANDLERS.get(type(content))
+    if handler is not None:
+        return handler(content)
+
+    if isinstance(content, dict):
+        return _dict_text(content)
+    if getattr(content, "type", None) == "text":
+        return getattr(content, "text", "")
+    return None
+
+
 def convert_prompt_message_to_message_param(
     prompt_message: "PromptMessage",
 ) -> MessageParam:
-    role = "user" if prompt_message.role == "user" else "assistant"
+    role = _ROLES.get(prompt_message.role, "assistant")
 
     content = prompt_message.content
 
-    # Check if content is a dict-like object with a "type" field
-    if isinstance(content, dict) or hasattr(content, "__dict__"):
-        content_type = (
-            content.get("type", None)
-            if isinstance(content, dict)
-            else getattr(content, "type", None)
-        )
-        if content_type == "text":
-            content_text = (
-                content.get("text", "")
-                if isinstance(content, dict)
-                else getattr(content, "text", "")
-            )
-            return {"role": role, "content": content_text}
+    content_text = _text_of(content)
+    if content_text is not None:
+        return {"role": role, "content": content_text}
 
     if isinstance(content, list):
-        text_blocks = []
-        for item in content:
-            # Check if item is a dict-like object with a "type" field
-            if isinstance(item, dict) or hasattr(item, "__dict__"):
-                item_type = (
-                    item.get("type", None)
-                    if isinstance(item, dict)
-                    else getattr(item, "type", None)
-                )
-                if item_type == "text":
-                    item_text = (
-                        item.get("text", "")
-                        if isinstance(item, dict)
-                        else getattr(item, "text", "")
-                    )
-                    text_blocks.append({"type": "text", "text": item_text})
-
+        text_blocks = [
+            {"type": "text", "text": item_text}
+            for item in content
+            if (item_text := _text_of(item)) is not None
+        ]
         if text_blocks:
             return {"role": role, "content": text_blocks}
 
@@ -79,6 +84,4 @@ def convert_prompt_message_to_message_param(
 def convert_prompt_messages_to_message_params(
     prompt_messages: List[PromptMessage],
 ) -> List[MessageParam]:
-    return [
-        convert_prompt_message_to_message_param(msg) for msg in prompt_messages
-    ]
+    return list(map(convert_prompt_message_to_message_param, prompt_messages))
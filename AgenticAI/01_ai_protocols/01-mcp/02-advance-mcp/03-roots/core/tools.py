@@ -1,8 +1,9 @@
+import asyncio
 import json
 from typing import Optional, Literal, List
 from mcp.types import CallToolResult, Tool, TextContent
 from mcp_client import MCPClient
-from anthropic.types import Message, ToolResultBlockParam
+from anthropic.types import Message, ToolResultBlockParam, ToolUseBlock
 
 
 class ToolManager:
@@ -49,60 +50,71 @@ class ToolManager:
             "is_error": status == "error",
         }
 
+    @classmethod
+    async def _execute_tool_request(
+        cls, clients: dict[str, MCPClient], tool_request: ToolUseBlock
+    ) -> ToolResultBlockParam:
+        """Executes a single tool request and builds its result part."""
+        tool_use_id = tool_request.id
+        tool_name = tool_request.name
+        tool_input = tool_request.input
+
+        client = await cls._find_client_with_tool(
+            list(clients.values()), tool_name
+        )
+
+        if not client:
+            return cls._build_tool_result_part(
+                tool_use_id, "Could not find that tool", "error"
+            )
+
+        tool_output = None
+        try:
+            tool_output: CallToolResult | None = await client.call_tool(
+                tool_name, tool_input
+            )
+            items = []
+            if tool_output:
+                items = tool_output.content
+            content_list = [
+                item.text for item in items if isinstance(item, TextContent)
+            ]
+            content_json = json.dumps(content_list)
+            tool_result_part = cls._build_tool_result_part(
+                tool_use_id,
+                content_json,
+                "error"
+                if tool_output and tool_output.isError
+                else "success",
+            )
+        except Exception as e:
+            error_message = f"Error executing tool '{tool_name}': {e}"
+            print(error_message)
+            tool_result_part = cls._build_tool_result_part(
+                tool_use_id,
+                json.dumps({"error": error_message}),
+                "error",
+            )
+
+        return tool_result_part
+
     @classmethod
     async def execute_tool_requests(
         cls, clients: dict[str, MCPClient], message: Message
     ) -> List[ToolResultBlockParam]:
-        """Executes a list of tool requests against the provided clients."""
+        """Executes a list of tool requests against the provided clients.
+
+        The requests are independent of each other, so they run concurrently.
+        Results are returned in the order the tools were requested.
+        """
         tool_requests = [
             block for block in message.content if block.type == "tool_use"
         ]
-        tool_result_blocks: list[ToolResultBlockParam] = []
-        for tool_request in tool_requests:
-            tool_use_id = tool_request.id
-            tool_name = tool_request.name
-            tool_input = tool_request.input
-
-            client = await cls._find_client_with_tool(
-                list(clients.values()), tool_name
-            )
-
-            if not client:
-                tool_result_part = cls._build_tool_result_part(
-                    tool_use_id, "Could not find that tool", "error"
+        return list(
+            await asyncio.gather(
+                *(
+                    cls._execute_tool_request(clients, tool_request)
+                    for tool_request in tool_requests
                 )
-                tool_result_blocks.append(tool_result_part)
-                continue
-
-            tool_output = None
-            try:
-                tool_output: CallToolResult | None = await client.call_tool(
-                    tool_name, tool_input
-                )
-                items = []
-                if tool_output:
-                    items = tool_output.content
-                content_list = [
-                    item.text for item in items if isinstance(item, TextContent)
-                ]
-                content_json = json.dumps(content_list)
-                tool_result_part = cls._build_tool_result_part(
-                    tool_use_id,
-                    content_json,
-                    "error"
-                    if tool_output and tool_output.isError
-                    else "success",
-                )
-            except Exception as e:
-                error_message = f"Error executing tool '{tool_name}': {e}"
-                print(error_message)
-                tool_result_part = cls._build_tool_result_part(
-                    tool_use_id,
-                    json.dumps({"error": error_message}),
-                    "error"
-                    if tool_output and tool_output.isError
-                    else "success",
-                )
-
-            tool_result_blocks.append(tool_result_part)
-        return tool_result_blocks
+            )
+        )
@@ -1,13 +1,22 @@
+import re
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
+# Matches the leading slash in front of a Windows drive letter ("/C:/...")
+_DRIVE_LETTER = re.compile(r"^/[A-Za-z]:")
+
 
 def file_url_to_path(file_url) -> Path:
     """Convert a file:// URL to a Path object."""
-    url_str = str(file_url)
+    return _file_url_to_path(str(file_url))
+
+
+@lru_cache(maxsize=1024)
+def _file_url_to_path(url_str: str) -> Path:
     parsed = urlparse(url_str)
     path = unquote(parsed.path)
-    if len(path) > 2 and path[0] == "/" and path[2] == ":":
+    if _DRIVE_LETTER.match(path):
         path = path[1:]
 
-    return Path(path)
\ No newline at end of file
+    return Path(path)
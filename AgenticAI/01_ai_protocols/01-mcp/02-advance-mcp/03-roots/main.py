@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from contextlib import AsyncExitStack
 
 from mcp_client import MCPClient
+from core.anthropic_singleton import close_client
 from core.claude import Claude
 
 from core.cli_chat import CliChat
@@ -40,6 +41,9 @@ async def main():
     clients = {}
 
     async with AsyncExitStack() as stack:
+        # Closes the Anthropic client shared by every Claude instance
+        stack.push_async_callback(close_client)
+
         # Create the MCP client with the provided root directories
         doc_client = await stack.enter_async_context(
             MCPClient(command="uv", args=["run", "mcp_server.py"], roots=root_paths)
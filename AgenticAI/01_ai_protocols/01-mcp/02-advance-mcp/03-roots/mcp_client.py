@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Optional, Any
 from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters, types
@@ -7,9 +8,13 @@ from mcp.shared.context import RequestContext
 from pathlib import Path
 from pydantic import FileUrl
 
-import json
 from pydantic import AnyUrl
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 class MCPClient:
     def __init__(
@@ -22,14 +27,22 @@ class MCPClient:
         self._command = command
         self._args = args
         self._env = env
-        self._roots = self._create_roots(roots) if roots else []
+        self._root_paths = roots or []
         self._session: Optional[ClientSession] = None
         self._exit_stack: AsyncExitStack = AsyncExitStack()
+        self._tools_cache: Optional[list[types.Tool]] = None
+        self._prompts_cache: Optional[list[types.Prompt]] = None
 
     # creating root objects
     # ---------------------
     # According to the MCP spec, all roots should have a URI that begins with file://.
     # This function takes the list of paths of that the user provided and turns them into Root objects.
+    # Resolving paths touches the filesystem, so this is only done the first time the server
+    # asks for the roots, and the result is reused for later requests.
+    @cached_property
+    def _roots(self) -> list[Root]:
+        return self._create_roots(self._root_paths)
+
     def _create_roots(self, root_paths: list[str]) -> list[Root]:
         """Convert path strings to Root objects."""
         roots = []
@@ -52,6 +65,21 @@ class MCPClient:
         """Callback for when server requests roots."""
         return ListRootsResult(roots=self._roots)
 
+    # caching listings
+    # ----------------
+    # Tool and prompt listings rarely change, so they are cached after the first request.
+    # The server tells us when they do change by sending a list_changed notification,
+    # and this handler drops the matching cache so the next call fetches a fresh list.
+    async def _handle_message(self, message) -> None:
+        """Callback for messages from the server."""
+        if not isinstance(message, types.ServerNotification):
+            return
+
+        if isinstance(message.root, types.ToolListChangedNotification):
+            self._tools_cache = None
+        elif isinstance(message.root, types.PromptListChangedNotification):
+            self._prompts_cache = None
+
     async def connect(self):
         server_params = StdioServerParameters(
             command=self._command,
@@ -67,8 +95,9 @@ class MCPClient:
                 _stdio,
                 _write,
                 list_roots_callback=self._handle_list_roots
-                if self._roots
+                if self._root_paths
                 else None,
+                message_handler=self._handle_message,
             )
         )
         await self._session.initialize()
@@ -81,8 +110,10 @@ class MCPClient:
         return self._session
 
     async def list_tools(self) -> list[types.Tool]:
-        result = await self.session().list_tools()
-        return result.tools
+        if self._tools_cache is None:
+            result = await self.session().list_tools()
+            self._tools_cache = result.tools
+        return self._tools_cache
 
     async def call_tool(
         self, tool_name: str, tool_input
@@ -90,8 +121,10 @@ class MCPClient:
         return await self.session().call_tool(tool_name, tool_input)
 
     async def list_prompts(self) -> list[types.Prompt]:
-        result = await self.session().list_prompts()
-        return result.prompts
+        if self._prompts_cache is None:
+            result = await self.session().list_prompts()
+            self._prompts_cache = result.prompts
+        return self._prompts_cache
 
     async def get_prompt(self, prompt_name, args: dict[str, str]):
         result = await self.session().get_prompt(prompt_name, args)
@@ -103,13 +136,15 @@ class MCPClient:
 
         if isinstance(resource, types.TextResourceContents):
             if resource.mimeType == "application/json":
-                return json.loads(resource.text)
+                return json_loads(resource.text)
 
             return resource.text
 
     async def cleanup(self):
         await self._exit_stack.aclose()
         self._session = None
+        self._tools_cache = None
+        self._prompts_cache = None
 
     async def __aenter__(self):
         await self.connect()
@@ -1,4 +1,9 @@
+import os
+import stat
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from weakref import WeakKeyDictionary
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 from mcp.server.fastmcp import Context
@@ -8,29 +13,90 @@ from core.utils import file_url_to_path
 mcp = FastMCP("VidsMCP", log_level="ERROR")
 
 
+# caching roots
+# -------------
+# Every call to ctx.session.list_roots() is a round trip to the client. Roots rarely change,
+# so the root paths are parsed and resolved once, kept per client session for a few seconds
+# and reused by every check made in that window.
+# Alongside the paths we keep a trie of their components: checking a path then means walking
+# its components once, however many roots there are.
+ROOTS_CACHE_TTL = 5.0
+
+# Marks a trie node that is itself a root. Path.parts never contains an empty string.
+_ROOT_MARK = ""
+
+
+@dataclass
+class CachedRoots:
+    expires_at: float
+    paths: list[Path]
+    trie: dict
+    # What the list_roots tool returns, built once per fetch
+    listing: list[str]
+
+
+_roots_cache: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def build_roots_trie(root_paths: list[Path]) -> dict:
+    trie: dict = {}
+    for root_path in root_paths:
+        node = trie
+        for part in root_path.parts:
+            node = node.setdefault(os.path.normcase(part), {})
+        node[_ROOT_MARK] = True
+    return trie
+
+
+def is_under_root(path: Path, roots_trie: dict) -> bool:
+    node = roots_trie
+    for part in path.parts:
+        if _ROOT_MARK in node:
+            return True
+        node = node.get(os.path.normcase(part))
+        if node is None:
+            return False
+    return _ROOT_MARK in node
+
+
+async def get_roots(ctx: Context) -> CachedRoots:
+    session = ctx.session
+    cached = _roots_cache.get(session)
+    if cached is not None and time.monotonic() < cached.expires_at:
+        return cached
+
+    roots_result = await session.list_roots()
+    root_paths = [
+        file_url_to_path(root.uri).resolve() for root in roots_result.roots
+    ]
+    cached = CachedRoots(
+        expires_at=time.monotonic() + ROOTS_CACHE_TTL,
+        paths=root_paths,
+        trie=build_roots_trie(root_paths),
+        listing=[str(root_path) for root_path in root_paths],
+    )
+    _roots_cache[session] = cached
+    return cached
+
+
 # authorizing access
 # ------------------
 # Remember: the MCP SDK does not attempt to limit what files or folders your tools attempt to read! You must implement that check yourself.
 # Consider implementing a function like is_path_allowed, which will decide whether a path is accessible by comparing it to the list of roots.
+# requested_path must already be resolved (absolute, symlinks followed), as the roots are.
 async def is_path_allowed(requested_path: Path, ctx: Context) -> bool:
-    roots_result = await ctx.session.list_roots()
-    client_roots = roots_result.roots
+    roots = await get_roots(ctx)
 
-    if not requested_path.exists():
+    # One stat() call answers both "does it exist?" and "is it a file?"
+    try:
+        st = os.stat(requested_path)
+    except (FileNotFoundError, NotADirectoryError):
         return False
 
-    if requested_path.is_file():
+    if stat.S_ISREG(st.st_mode):
         requested_path = requested_path.parent
 
-    for root in client_roots:
-        root_path = file_url_to_path(root.uri)
-        try:
-            requested_path.relative_to(root_path)
-            return True
-        except ValueError:
-            continue
-
-    return False
+    return is_under_root(requested_path, roots.trie)
 
 
 @mcp.tool()
@@ -48,7 +114,7 @@ async def convert_video(
     # ------------------
     # Once you've put an authorization function together - 
     # like is_path_allowed - use it throughout your tools to ensure the requested path is accessible.
-    if not await is_path_allowed(input_file, ctx):
+    if not await is_path_allowed(input_file.resolve(), ctx):
         raise ValueError(f"Access to path is not allowed: {input_path}")
 
     return await VideoConverter.convert(input_path, format)
@@ -69,14 +135,13 @@ async def list_roots(ctx: Context):
     List all directories that are accessible to this server.
     These are the root directories where files can be read from or written to.
     """
-    roots_result = await ctx.session.list_roots()
     # accessing the root
     # ------------------
     # Roots are accessed by calling ctx.session.list_roots().
     # This sends a message back to the client, which causes it to run the root-listing callback.
-    client_roots = roots_result.roots
-
-    return [file_url_to_path(root.uri) for root in client_roots]
+    # get_roots makes that call and caches the result for a few seconds.
+    roots = await get_roots(ctx)
+    return roots.listing
 
 
 @mcp.tool()
@@ -91,7 +156,9 @@ async def read_dir(
     if not await is_path_allowed(requested_path, ctx):
         raise ValueError("Error: can only read directories within a root")
 
-    return [entry.name for entry in requested_path.iterdir()]
+    # scandir reads entry names straight from the directory listing
+    with os.scandir(requested_path) as entries:
+        return [entry.name for entry in entries]
 
 
 if __name__ == "__main__":
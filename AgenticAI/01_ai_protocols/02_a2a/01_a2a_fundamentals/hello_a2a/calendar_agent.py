@@ -43,7 +43,7 @@ class CalendarAgentExecutor(AgentExecutor):
     
 # 🎯 CONCEPT 3: Agent Skills (What You Advertise to Others)
 calendar_skills = [
-    AgentSkill(
+    AgentSkill.model_construct(
         id="check_availability",           # Unique identifier
         name="Check Availability",        # Human-readable name
         description="Check free time slots for given dates and times",  # What it does
@@ -54,7 +54,7 @@ calendar_skills = [
             "Check if Tuesday afternoon is open"
         ]
     ),
-    AgentSkill(
+    AgentSkill.model_construct(
         id="schedule_meeting",
         name="Schedule Meeting",
         description="Schedule new meetings and send invitations",
@@ -65,7 +65,7 @@ calendar_skills = [
             "Set up a project review meeting"
         ]
     ),
-    AgentSkill(
+    AgentSkill.model_construct(
         id="find_conflicts",
         name="Find Conflicts",
         description="Identify scheduling conflicts and suggest alternatives",
@@ -79,7 +79,8 @@ calendar_skills = [
 ]
 
 # 🎯 CONCEPT 4: Agent Card (Your Digital Business Card)
-calendar_agent_card = AgentCard(
+# The card and its skills are static, so model_construct() skips re-validating them at startup
+calendar_agent_card = AgentCard.model_construct(
     # Basic Identity
     name="Personal Calendar Agent",
     description="Manages scheduling, availability, and calendar coordination using A2A SDK",
@@ -136,4 +137,4 @@ if __name__ == "__main__":
     
     app: FastAPI = server.build()
 
-    uvicorn.run(server.build(), host="localhost", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="localhost", port=8001)
\ No newline at end of file
@@ -2,7 +2,7 @@ from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
 # 🎯 CONCEPT 3: Agent Skills (What You Advertise to Others)
 agent_skills = [
-    AgentSkill(
+    AgentSkill.model_construct(
         id="check_availability",           # Unique identifier
         name="Check Availability",        # Human-readable name
         description="Check free time slots for given dates and times",  # What it does
@@ -17,7 +17,8 @@ agent_skills = [
 ]
 
 # 🎯 CONCEPT 4: Agent Card (Your Digital Business Card)
-agent_card = AgentCard(
+# Built with model_construct(): these values never change, so pydantic validation is skipped
+agent_card = AgentCard.model_construct(
     # Basic Identity
     name="Personal Agent",
     description="Manages scheduling, availability, and calendar coordination using A2A SDK",
@@ -1,12 +1,28 @@
 # greet_agent.py
+import hashlib
+import json
+import re
+from fastapi import FastAPI, Request, Response
 from a2a.server.apps import A2AFastAPIApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue, InMemoryQueueManager
-from a2a.utils import new_agent_text_message
+from a2a.utils import AGENT_CARD_WELL_KNOWN_PATH, new_agent_text_message
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
+# Keyword -> response template; when several keywords match, the first one listed wins
+GREETING_RESPONSES = {
+    "hello": "👋 Hello there! You said: '{}'",
+    "goodbye": "👋 Goodbye! Thanks for saying: '{}'",
+    "how are you": "😊 I'm doing great! You asked: '{}'",
+}
+# All keywords in one case-insensitive pattern, so the input is scanned once
+GREETING_PATTERN = re.compile(
+    r"(?i)\b(" + "|".join(map(re.escape, GREETING_RESPONSES)) + r")\b"
+)
+DEFAULT_RESPONSE = "🤖 I received your message: '{}'. Try saying hello!"
+
 class GreetingExecutor(AgentExecutor):
     """Agent executor that provides greeting responses."""
     
@@ -19,14 +35,12 @@ class GreetingExecutor(AgentExecutor):
         print(f"💬 Received message: '{user_input}'")
         
         # Generate personalized greeting response
-        if "hello" in user_input.lower():
-            response = f"👋 Hello there! You said: '{user_input}'"
-        elif "goodbye" in user_input.lower():
-            response = f"👋 Goodbye! Thanks for saying: '{user_input}'"
-        elif "how are you" in user_input.lower():
-            response = f"😊 I'm doing great! You asked: '{user_input}'"
-        else:
-            response = f"🤖 I received your message: '{user_input}'. Try saying hello!"
+        matched = {keyword.lower() for keyword in GREETING_PATTERN.findall(user_input)}
+        template = next(
+            (template for keyword, template in GREETING_RESPONSES.items() if keyword in matched),
+            DEFAULT_RESPONSE
+        )
+        response = template.format(user_input)
         
         # Send response back to client
         await event_queue.enqueue_event(new_agent_text_message(response))
@@ -36,7 +50,8 @@ class GreetingExecutor(AgentExecutor):
         await event_queue.enqueue_event(new_agent_text_message("Request cancelled"))
 
 # Define agent card with capabilities
-greeting_card = AgentCard(
+# Static card - model_construct() builds it without running field validation
+greeting_card = AgentCard.model_construct(
     name="Greeting Agent",
     description="A friendly agent that responds to greetings and messages",
     url="http://localhost:8000/",
@@ -49,7 +64,7 @@ greeting_card = AgentCard(
     ),
     
     skills=[
-        AgentSkill(
+        AgentSkill.model_construct(
             id="greeting",
             name="Greeting & Conversation",
             description="Respond to greetings and casual conversation",
@@ -68,6 +83,27 @@ greeting_card = AgentCard(
     preferred_transport="JSONRPC"
 )
 
+def serve_cached_agent_card(app: FastAPI, agent_card: AgentCard) -> None:
+    """Serves the (static) agent card from bytes serialized once, with an ETag for 304s."""
+    card_bytes = json.dumps(
+        agent_card.model_dump(mode="json", exclude_none=True, by_alias=True),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+    etag = f'"{hashlib.blake2b(card_bytes, digest_size=8).hexdigest()}"'
+
+    async def get_agent_card(request: Request) -> Response:
+        headers = {"ETag": etag}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+            return Response(status_code=304, headers=headers)
+        return Response(card_bytes, media_type="application/json", headers=headers)
+
+    app.get(AGENT_CARD_WELL_KNOWN_PATH)(get_agent_card)
+    # Routes match in order, so move it ahead of the one build() added
+    app.router.routes.insert(0, app.router.routes.pop())
+
+
 if __name__ == "__main__":
     # Create and configure A2A server
     request_handler = DefaultRequestHandler(
@@ -86,5 +122,8 @@ if __name__ == "__main__":
     print("📮 A2A Endpoint: http://localhost:8000/a2a")
     print("⚡ Ready for A2A client connections!")
     
+    app = server.build()
+    serve_cached_agent_card(app, greeting_card)
+
     import uvicorn
-    uvicorn.run(server.build(), host="localhost", port=8000)
+    uvicorn.run(app, host="localhost", port=8000)
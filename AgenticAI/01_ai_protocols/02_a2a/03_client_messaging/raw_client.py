@@ -1,14 +1,29 @@
 import httpx
 import json
 
+# Encode/decode the JSON-RPC payloads ourselves so orjson can be used when it's
+# installed (httpx's json= and .json() always go through the stdlib json module).
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+JSON_HEADERS = {"content-type": "application/json"}
+
 async def main():
     # Method 1: Direct A2A endpoint (JSON-RPC 2.0)
     async with httpx.AsyncClient() as client:
         discovery_response = await client.get("http://localhost:8000/.well-known/agent-card.json")
-        agent_card = discovery_response.json()
+        agent_card = json_loads(discovery_response.content)
         print("\n\nAgent Card:\n\n", json.dumps(agent_card, indent=2), "\n\n")
 
-        response = await client.post("http://localhost:8000", json={
+        response = await client.post("http://localhost:8000", headers=JSON_HEADERS, content=json_dumps({
             "jsonrpc": "2.0",
             "method": "message/send",
             "params": {
@@ -22,8 +37,8 @@ async def main():
                     }
             },
             "id": "req-123"
-        })
-        result = response.json()
+        }))
+        result = json_loads(response.content)
         print("\n\nRES\n\n", result)
     
 if __name__ == "__main__":
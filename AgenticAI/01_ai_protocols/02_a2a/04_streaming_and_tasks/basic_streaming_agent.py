@@ -1,10 +1,117 @@
 import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from a2a.server.apps import A2AFastAPIApplication
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.server.tasks import InMemoryTaskStore, TaskStore, TaskUpdater
 from a2a.server.events import EventQueue, InMemoryQueueManager
-from a2a.types import AgentCard, AgentCapabilities, Part, TextPart, TaskState
+from a2a.types import AgentCard, AgentCapabilities, Part, Task, TextPart, TaskState
+
+logger = logging.getLogger(__name__)
+
+
+class RedisTaskStore(TaskStore):
+    """Keeps tasks in Redis, so they outlive the process and other workers can read them.
+
+    A streaming task is saved after every status update. Saves are held for
+    `flush_interval` seconds (10 ms by default), so a burst of them is written
+    as the latest version of each task in one pipelined round trip. Until a
+    save is flushed only this process sees it (from the local pending map),
+    and it is lost if the process dies in that window. A write that fails is
+    logged and retried after `retry_interval` seconds. Call aclose() on
+    shutdown to write out what is still pending.
+
+    Needs redis-py 5 or newer (the project's "redis" extra).
+    """
+
+    def __init__(self, redis, ttl: int = 24 * 60 * 60, flush_interval: float = 0.01,
+                 retry_interval: float = 1.0, key_prefix: str = "a2a:task:"):
+        self.redis = redis
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.key_prefix = key_prefix
+        self._pending: dict[str, Task] = {}
+        self._timer: asyncio.Task | None = None
+        # One write at a time, so an older batch can't land after a newer one
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisTaskStore":
+        import redis.asyncio as redis  # only needed when REDIS_URL is set
+
+        return cls(redis.from_url(url), **kwargs)
+
+    async def save(self, task: Task) -> None:
+        self._pending[task.id] = task
+        self._schedule_flush(self.flush_interval)
+
+    async def get(self, task_id: str) -> Task | None:
+        if (task := self._pending.get(task_id)) is not None:
+            return task
+        data = await self.redis.get(self.key_prefix + task_id)
+        return Task.model_validate_json(data) if data is not None else None
+
+    async def delete(self, task_id: str) -> None:
+        async with self._write_lock:
+            self._pending.pop(task_id, None)
+            await self.redis.delete(self.key_prefix + task_id)
+
+    def _schedule_flush(self, delay: float):
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Writing tasks to Redis failed, retrying in %ss", self.retry_interval)
+            self._schedule_flush(self.retry_interval)
+
+    async def flush(self):
+        """Writes every pending task in one pipeline."""
+        async with self._write_lock:
+            if not self._pending:
+                return
+
+            batch = dict(self._pending)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for task_id, task in batch.items():
+                    pipe.set(self.key_prefix + task_id, task.model_dump_json(exclude_none=True), ex=self.ttl)
+                await pipe.execute()
+
+            # Saves made while the write was in flight stay pending
+            for task_id, task in batch.items():
+                if self._pending.get(task_id) is task:
+                    del self._pending[task_id]
+
+    async def aclose(self):
+        """Writes out pending tasks and closes the Redis connection."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            await self.flush()
+        finally:
+            await self.redis.aclose()
+
+
+async def simulate_work(steps: list[str], progress_queue: asyncio.Queue):
+    """Stands in for real work, putting a progress message on the queue per step.
+
+    None is put last, also when the work fails, to tell the reader it's done.
+    """
+    try:
+        for i, step in enumerate(steps):
+            progress_queue.put_nowait(f"{step} ({i+1}/{len(steps)})")
+            await asyncio.sleep(1)  # Simulate work
+    finally:
+        progress_queue.put_nowait(None)
+
 
 class BasicStreamingExecutor(AgentExecutor):
     """Demonstrates A2A streaming with TaskStatusUpdateEvent and TaskArtifactUpdateEvent."""
@@ -29,15 +136,31 @@ class BasicStreamingExecutor(AgentExecutor):
             "📝 Generating response..."
         ]
 
-        for i, step in enumerate(progress_steps):
-            # This streams a TaskStatusUpdateEvent
-            await updater.update_status(
-                TaskState.working,
-                message=updater.new_agent_message([
-                    Part(root=TextPart(text=f"{step} ({i+1}/{len(progress_steps)})"))
-                ])
-            )
-            await asyncio.sleep(1)  # Simulate work
+        # The work reports progress on a queue; we wake up only when it does.
+        progress_queue: asyncio.Queue[str | None] = asyncio.Queue()
+        worker = asyncio.create_task(simulate_work(progress_steps, progress_queue))
+
+        try:
+            finished = False
+            while not finished:
+                # Drain everything reported since the last wake-up; only the latest matters
+                items = [await progress_queue.get()]
+                while not progress_queue.empty():
+                    items.append(progress_queue.get_nowait())
+                if items[-1] is None:
+                    finished = True
+                    items.pop()
+                if items:
+                    # This streams a TaskStatusUpdateEvent
+                    await updater.update_status(
+                        TaskState.working,
+                        message=updater.new_agent_message([
+                            Part(root=TextPart(text=items[-1]))
+                        ])
+                    )
+            await worker  # re-raises if the work failed
+        finally:
+            worker.cancel()
 
         # Step 4: Create and stream the final result (TaskArtifactUpdateEvent)
         result_text = f"✅ Completed processing: '{user_input}'\n\nProcessed at: {asyncio.get_event_loop().time()}"
@@ -77,10 +200,15 @@ agent_card = AgentCard(
 )
 
 if __name__ == "__main__":
+    # Set REDIS_URL (e.g. redis://localhost:6379/0) to share tasks between workers.
+    # Event queues stay in memory: they belong to the process holding the SSE stream.
+    redis_url = os.environ.get("REDIS_URL")
+    task_store = RedisTaskStore.from_url(redis_url) if redis_url else InMemoryTaskStore()
+
     # Create the A2A server with streaming support
     request_handler = DefaultRequestHandler(
         agent_executor=BasicStreamingExecutor(),
-        task_store=InMemoryTaskStore(),
+        task_store=task_store,
         queue_manager=InMemoryQueueManager()
     )
 
@@ -93,5 +221,20 @@ if __name__ == "__main__":
     print("🔗 Agent Card: http://localhost:8001/.well-known/agent-card.json")
     print("📮 A2A Endpoint: http://localhost:8001")
 
+    app = server.build()
+    if redis_url:
+        sdk_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app):
+            try:
+                async with sdk_lifespan(app):
+                    yield
+            finally:
+                # Write out saves still waiting for their flush
+                await task_store.aclose()
+
+        app.router.lifespan_context = lifespan
+
     import uvicorn
-    uvicorn.run(server.build(), host="localhost", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="localhost", port=8001)
\ No newline at end of file
@@ -1,6 +1,56 @@
 import asyncio
 import httpx
-import json
+
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+
+def print_event(result: dict) -> bool:
+    """Print one A2A streaming event. Returns True once the stream is final."""
+    kind = result.get("kind")
+
+    if kind == "task":
+        task_id = result.get("id")
+        context_id = result.get("contextId")
+        print(f"📋 Task Created: {task_id[:8]}... (context: {context_id[:8]}...)")
+
+    elif kind == "status-update":
+        status = result.get("status", {})
+        state = status.get("state")
+        message = status.get("message", {})
+
+        if message.get("parts"):
+            text = message["parts"][0].get("text", "")
+            print(f"📊 Status [{state}]: {text}")
+
+        if result.get("final"):
+            print(f"🏁 Stream ended (final status: {state})")
+            return True
+
+    elif kind == "artifact-update":
+        artifact = result.get("artifact", {})
+        name = artifact.get("name")
+        last_chunk = result.get("lastChunk", False)
+
+        if artifact.get("parts"):
+            content = artifact["parts"][0].get("text", "")
+            preview = content[:100] + "..." if len(content) > 100 else content
+            print(f"📄 Artifact '{name}': {preview}")
+            if last_chunk:
+                print(f"✅ Artifact '{name}' completed")
+
+    return False
+
 
 async def test_basic_streaming():
     """Test the basic streaming agent with real SSE."""
@@ -12,7 +62,7 @@ async def test_basic_streaming():
         async with client.stream(
             "POST",
             "http://localhost:8001",
-            json={
+            content=json_dumps({
                 "jsonrpc": "2.0",
                 "method": "message/stream",  # Use streaming method
                 "params": {
@@ -24,50 +74,31 @@ async def test_basic_streaming():
                     }
                 },
                 "id": "stream-test-1"
-            },
-            headers={"Accept": "text/event-stream"}
+            }),
+            headers={"Accept": "text/event-stream", "Content-Type": "application/json"}
         ) as response:
             
             print("📥 Streaming events:")
-            async for chunk in response.aiter_text():
-                if chunk.startswith("data: "):
-                    try:
-                        event_data = json.loads(chunk[6:])  # Remove "data: " prefix
-                        result = event_data.get("result", {})
-                        kind = result.get("kind")
-
-                        if kind == "task":
-                            task_id = result.get("id")
-                            context_id = result.get("contextId")
-                            print(f"📋 Task Created: {task_id[:8]}... (context: {context_id[:8]}...)")
-
-                        elif kind == "status-update":
-                            status = result.get("status", {})
-                            state = status.get("state")
-                            message = status.get("message", {})
-
-                            if message.get("parts"):
-                                text = message["parts"][0].get("text", "")
-                                print(f"📊 Status [{state}]: {text}")
-
-                            if result.get("final"):
-                                print(f"🏁 Stream ended (final status: {state})")
-                                break
-
-                        elif kind == "artifact-update":
-                            artifact = result.get("artifact", {})
-                            name = artifact.get("name")
-                            last_chunk = result.get("lastChunk", False)
-
-                            if artifact.get("parts"):
-                                content = artifact["parts"][0].get("text", "")
-                                preview = content[:100] + "..." if len(content) > 100 else content
-                                print(f"📄 Artifact '{name}': {preview}")
-                                if last_chunk:
-                                    print(f"✅ Artifact '{name}' completed")
-
-                    except json.JSONDecodeError:
-                        continue
+            # An SSE event is one or more "data:" lines followed by a blank line.
+            # Reading whole lines means an event split across network chunks
+            # (or several events in one chunk) is still parsed correctly.
+            data_lines = []
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].removeprefix(" "))
+                    continue
+                if line or not data_lines:
+                    continue  # Other SSE fields, comments and keep-alives
+
+                payload = "\n".join(data_lines)
+                data_lines = []
+                try:
+                    event_data = json_loads(payload)
+                except ValueError:
+                    continue
+
+                if print_event(event_data.get("result", {})):
+                    break
 
     print("\n🎯 Test completed! The agent streamed real A2A events.")
 
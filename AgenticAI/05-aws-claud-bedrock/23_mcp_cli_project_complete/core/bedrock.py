@@ -1,15 +1,148 @@
-import boto3
-from typing import Optional, Union, Dict
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from functools import lru_cache, partial
+from importlib.util import find_spec
+from typing import Callable, Iterator, Optional, Sequence, Union, Dict
 from mcp.types import Tool, PromptMessage, TextContent
 
+# boto3, aioboto3 and botocore take a few hundred ms to import, so they are
+# only imported once the first client is built
+HAS_AIOBOTO3 = find_spec("aioboto3") is not None
+
+# Marks the end of a prompt prefix Bedrock should cache. Repeated prefixes
+# (tool specs, system prompt, conversation so far) are then read from the
+# cache at a fraction of the input token price and latency.
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+# Put on the event queue once a blocking boto3 stream is exhausted
+_STREAM_END = object()
+
+
+@lru_cache(maxsize=None)
+def _make_client(profile_name: str, region_name: str):
+    """One boto3 bedrock-runtime client per profile and region.
+
+    Building a client loads botocore's service model, so Bedrock instances
+    for the same profile and region share it.
+    """
+    import boto3
+
+    session = boto3.Session(profile_name=profile_name)
+    return session.client("bedrock-runtime", region_name=region_name)
+
+
+@lru_cache(maxsize=None)
+def _make_async_session(profile_name: str):
+    import aioboto3
+
+    return aioboto3.Session(profile_name=profile_name)
+
 
 class Bedrock:
-    def __init__(self, region_name: str, model_id: str, profile_name: str = "default"):
-        session = boto3.Session(profile_name=profile_name)
-        self.client = session.client("bedrock-runtime", region_name=region_name)
-        #self.client = boto3.client("bedrock-runtime", region_name=region_name)
+    def __init__(
+        self,
+        region_name: str,
+        model_id: str,
+        profile_name: str = "default",
+        latency: str = "standard",
+        prompt_caching: bool = True,
+    ):
         self.model_id = model_id
         self.region_name = region_name
+        # "optimized" asks Bedrock for latency-optimized inference
+        self.latency = latency
+        self.prompt_caching = prompt_caching
+
+        # With aioboto3 the converse call is awaited, so MCP traffic and other
+        # chats keep running while Bedrock generates. The client is opened on
+        # first use and kept until aclose().
+        self.client = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._async_session = None
+        self._async_client = None
+        self._async_client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+        if HAS_AIOBOTO3:
+            self._async_session = _make_async_session(profile_name)
+        else:
+            print(
+                "Warning: aioboto3 is not installed, Bedrock calls will run on "
+                "worker threads. Install it with: uv pip install aioboto3"
+            )
+            self.client = _make_client(profile_name, region_name)
+            # boto3 clients are thread-safe, so the worker threads share this one
+            self._executor = ThreadPoolExecutor(max_workers=8)
+
+    async def _invoke(self, operation: str, params: dict) -> dict:
+        """Calls a bedrock-runtime operation ("converse", "converse_stream")."""
+        if self._async_session is None:
+            # Blocking boto3 call: run it off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(getattr(self.client, operation), **params)
+            )
+
+        async with self._async_client_lock:
+            if self._async_client is None:
+                self._async_client = await self._exit_stack.enter_async_context(
+                    self._async_session.client(
+                        "bedrock-runtime", region_name=self.region_name
+                    )
+                )
+        return await getattr(self._async_client, operation)(**params)
+
+    async def _send(self, operation: str, params: dict) -> dict:
+        # Already loaded by the client by now
+        from botocore.exceptions import ClientError
+
+        try:
+            return await self._invoke(operation, params)
+        except ClientError as e:
+            if (
+                "performanceConfig" not in params
+                or e.response["Error"]["Code"] != "ValidationException"
+            ):
+                raise
+            # Not every model/region offers optimized latency: retry without it
+            del params["performanceConfig"]
+            response = await self._invoke(operation, params)
+            print(
+                f"Latency-optimized inference is not available for "
+                f"{self.model_id}, using standard latency"
+            )
+            self.latency = "standard"
+            return response
+
+    async def _iter_events(self, stream):
+        """Yields the events of a converse_stream response stream."""
+        if hasattr(stream, "__aiter__"):
+            async for event in stream:
+                yield event
+            return
+
+        # boto3's stream blocks while reading: read it on a worker thread
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def pump():
+            try:
+                for event in stream:
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+        reader = loop.run_in_executor(self._executor, pump)
+        while (event := await queue.get()) is not _STREAM_END:
+            yield event
+        await reader  # re-raises a failed read
+
+    async def aclose(self):
+        await self._exit_stack.aclose()
+        self._async_client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def add_user_message(self, messages: list, content: Union[str, list]):
         if isinstance(content, str):
@@ -28,32 +161,53 @@ class Bedrock:
             assistant_message = {"role": "assistant", "content": content}
         messages.append(assistant_message)
 
-    def chat(
+    async def chat(
         self,
         messages: list,
         system: Optional[str] = None,
         temperature: float = 1.0,
-        stop_sequences: list = [],
+        stop_sequences: Optional[Sequence[str]] = None,
         tools: Optional[list[Tool]] = None,
+        bedrock_tools: Optional[list] = None,
         tool_choice: str = "auto",
         text_editor: Optional[str] = None,
         thinking: bool = False,
+        on_text: Optional[Callable[[str], None]] = None,
     ) -> dict:
+        """Sends the conversation to Bedrock and returns the reply.
+
+        With on_text, the reply is streamed (converse_stream) and on_text is
+        called with each piece of text as it arrives.
+        """
+        if self.prompt_caching and messages:
+            # Cache the conversation up to the newest message. The cache point
+            # is added to a copy: Bedrock allows only 4 per request, so they
+            # can't pile up in the stored history.
+            last = messages[-1]
+            messages = [
+                *messages[:-1],
+                {**last, "content": [*last["content"], CACHE_POINT]},
+            ]
+
+        # Optional fields are only sent when set
+        inference_config = {"temperature": temperature}
+        if stop_sequences:
+            inference_config["stopSequences"] = list(stop_sequences)
+
         params = {
             "modelId": self.model_id,
             "messages": messages,
-            "inferenceConfig": {
-                "temperature": temperature,
-                "stopSequences": stop_sequences,
-            },
+            "inferenceConfig": inference_config,
         }
 
         if system:
             params["system"] = [{"text": system}]
+            if self.prompt_caching:
+                params["system"].append(CACHE_POINT)
 
-        bedrock_tools = None
-        if tools:
-            bedrock_tools = to_bedrock_tools(tools)
+        # bedrock_tools: tool specs already converted with to_bedrock_tools
+        if bedrock_tools is None and tools:
+            bedrock_tools = to_bedrock_tools(tools, cache=self.prompt_caching)
 
         if bedrock_tools or text_editor:
             tool_choices = {
@@ -89,29 +243,86 @@ class Bedrock:
         if additional_model_fields:
             params["additionalModelRequestFields"] = additional_model_fields
 
-        response = self.client.converse(**params)
+        if self.latency == "optimized":
+            params["performanceConfig"] = {"latency": "optimized"}
+
+        if on_text is not None:
+            return await self._stream_reply(params, on_text)
 
+        response = await self._send("converse", params)
         output_content = (
             response.get("output", {}).get("message", {}).get("content", [])
         )
-        if not isinstance(output_content, list):
-            output_content = []
-
-        text_parts = [
-            p.get("text", "")
-            for p in output_content
-            if isinstance(p, dict) and "text" in p
-        ]
-
-        return {
-            "parts": output_content,
-            "stop_reason": response.get("stopReason", "unknown"),
-            "text": "\n".join(text_parts),
-        }
+        return _chat_result(output_content, response.get("stopReason", "unknown"))
+
+    async def _stream_reply(
+        self, params: dict, on_text: Callable[[str], None]
+    ) -> dict:
+        response = await self._send("converse_stream", params)
+
+        blocks: dict[int, dict] = {}
+        texts: dict[int, list[str]] = {}
+        stop_reason = "unknown"
+        async for event in self._iter_events(response["stream"]):
+            if "contentBlockDelta" in event:
+                index = event["contentBlockDelta"]["contentBlockIndex"]
+                delta = event["contentBlockDelta"]["delta"]
+                if "text" in delta:
+                    texts.setdefault(index, []).append(delta["text"])
+                    blocks.setdefault(index, {"text": ""})
+                    on_text(delta["text"])
+                elif "toolUse" in delta:
+                    blocks[index]["toolUse"]["input"] += delta["toolUse"]["input"]
+                elif "reasoningContent" in delta:
+                    reasoning = blocks.setdefault(
+                        index, {"reasoningContent": {"reasoningText": {"text": ""}}}
+                    )["reasoningContent"]["reasoningText"]
+                    reasoning["text"] += delta["reasoningContent"].get("text", "")
+                    if "signature" in delta["reasoningContent"]:
+                        reasoning["signature"] = delta["reasoningContent"]["signature"]
+            elif "contentBlockStart" in event:
+                index = event["contentBlockStart"]["contentBlockIndex"]
+                start = event["contentBlockStart"]["start"]
+                if "toolUse" in start:
+                    # Tool input arrives as JSON fragments, parsed at the end
+                    blocks[index] = {"toolUse": {**start["toolUse"], "input": ""}}
+            elif "messageStop" in event:
+                stop_reason = event["messageStop"].get("stopReason", "unknown")
+
+        output_content = []
+        for index in sorted(blocks):
+            block = blocks[index]
+            if "text" in block:
+                block["text"] = "".join(texts[index])
+            elif "toolUse" in block:
+                tool_input = block["toolUse"]["input"]
+                block["toolUse"]["input"] = json.loads(tool_input) if tool_input else {}
+            output_content.append(block)
+
+        return _chat_result(output_content, stop_reason)
+
 
+def _chat_result(output_content, stop_reason: str) -> dict:
+    """The dict chat returns: content parts, stop reason and joined text."""
+    if not isinstance(output_content, list):
+        output_content = []
 
-def to_bedrock_tools(tool_list: list[Tool]):
-    return [
+    # One pass; empty text parts would only add blank lines
+    text_parts = [
+        text
+        for p in output_content
+        if type(p) is dict and (text := p.get("text"))
+    ]
+
+    return {
+        "parts": output_content,
+        "stop_reason": stop_reason,
+        "text": "\n".join(text_parts),
+    }
+
+
+def to_bedrock_tools(tool_list: list[Tool], cache: bool = False):
+    bedrock_tools = [
         {
             "toolSpec": {
                 "name": tool.name,
@@ -127,11 +338,13 @@ def to_bedrock_tools(tool_list: list[Tool]):
         }
         for tool in tool_list
     ]
+    # A cache point with no tool specs before it would be sent as the only tool
+    if cache and bedrock_tools:
+        bedrock_tools.append(CACHE_POINT)
+    return bedrock_tools
 
 
-def to_bedrock_messages(messages: list[PromptMessage]) -> list[Dict]:
-    return [
-        {"role": m.role, "content": [{"text": m.content.text}]}
-        for m in messages
-        if isinstance(m.content, TextContent)
-    ]
+def to_bedrock_messages(messages: list[PromptMessage]) -> Iterator[Dict]:
+    for m in messages:
+        if isinstance(m.content, TextContent):
+            yield {"role": m.role, "content": [{"text": m.content.text}]}
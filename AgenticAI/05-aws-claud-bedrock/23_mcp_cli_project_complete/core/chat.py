@@ -1,5 +1,5 @@
-from typing import Dict
-from core.bedrock import Bedrock
+from typing import Callable, Dict, Optional
+from core.bedrock import Bedrock, to_bedrock_tools
 from mcp_client import MCPClient
 from core.tools import ToolManager
 
@@ -9,6 +9,26 @@ class Chat:
         self.bedrock_service: Bedrock = bedrock_service
         self.clients: dict[str, MCPClient] = clients
         self.messages: list[Dict] = []
+        self.tool_manager = ToolManager()
+        # Tool specs in Bedrock format, built once and reused by every request
+        self._bedrock_tools: Optional[list] = None
+        for client in clients.values():
+            client.add_tools_changed_listener(self.invalidate_tools)
+
+    def invalidate_tools(self):
+        self.tool_manager.invalidate()
+        self._bedrock_tools = None
+
+    async def _get_bedrock_tools(self) -> list:
+        if self._bedrock_tools is None:
+            tools = await self.tool_manager.get_all_tools(self.clients)
+            self._bedrock_tools = to_bedrock_tools(
+                tools, cache=self.bedrock_service.prompt_caching
+            )
+        return self._bedrock_tools
+
+    def _tools_ran(self):
+        """Called after each round of tool calls; tools may have changed data."""
 
     async def _process_query(self, query: str):
         self.messages.append({"role": "user", "content": [{"text": query}]})
@@ -16,15 +36,23 @@ class Chat:
     async def run(
         self,
         query: str,
+        on_text: Optional[Callable[[str], None]] = None,
     ) -> str:
+        """Answers the query, running tools as the model asks for them.
+
+        With on_text, replies are streamed to it as they are generated.
+        """
         final_text_response = ""
 
         await self._process_query(query)
 
+        bedrock_tools = await self._get_bedrock_tools()
+
         while True:
-            response = self.bedrock_service.chat(
+            response = await self.bedrock_service.chat(
                 messages=self.messages,
-                tools=await ToolManager.get_all_tools(self.clients),
+                bedrock_tools=bedrock_tools,
+                on_text=on_text,
             )
 
             self.bedrock_service.add_assistant_message(
@@ -32,14 +60,18 @@ class Chat:
             )
 
             if response["stop_reason"] == "tool_use":
-                print(response["text"])
-                tool_result_parts = await ToolManager.execute_tool_requests(
+                if on_text is None:
+                    print(response["text"])
+                else:
+                    on_text("\n")
+                tool_result_parts = await self.tool_manager.execute_tool_requests(
                     self.clients, response["parts"]
                 )
 
                 self.bedrock_service.add_user_message(
                     self.messages, tool_result_parts
                 )
+                self._tools_ran()
             else:
                 final_text_response = response["text"]
                 break
@@ -1,3 +1,4 @@
+import sys
 from typing import List, Optional
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer, Completion
@@ -176,6 +177,10 @@ class CliApp:
             auto_suggest=self.command_autosuggester,
         )
 
+    def _write(self, text: str):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
     async def initialize(self):
         await self.refresh_resources()
         await self.refresh_prompts()
@@ -203,8 +208,10 @@ class CliApp:
                 if not user_input.strip():
                     continue
 
-                response = await self.agent.run(user_input)
-                print(f"\nResponse:\n{response}")
+                # The reply is printed as it streams in
+                print("\nResponse:")
+                await self.agent.run(user_input, on_text=self._write)
+                print()
 
             except KeyboardInterrupt:
                 break
@@ -1,10 +1,81 @@
-from typing import Tuple
+import asyncio
+import re
+import time
+from typing import Callable, Optional
 from mcp.types import Prompt, PromptMessage
 
 from core.chat import Chat
 from core.bedrock import Bedrock, to_bedrock_messages
 from mcp_client import MCPClient
 
+# How long (in seconds) document ids and contents read from the doc server
+# are reused before being read again
+DOCS_CACHE_TTL = 30.0
+
+# Documents are handed to the model split into passages with ids. Instead of
+# copying a passage into its answer, the model writes <cite id="..."/>, which
+# is expanded back to the passage text here. The model generates a handful of
+# tokens instead of the whole quote.
+_CITE = re.compile(r'<cite id="([^"]+)"\s*/>')
+
+# The query prompt is these fixed pieces around the query and the context
+_PROMPT_PRE = """
+The user has a question:
+<query>
+"""
+_PROMPT_MID = """
+</query>
+
+The following context may be useful in answering their question:
+<context>
+"""
+_PROMPT_POST = """
+</context>
+
+Note the user's query might contain references to documents like "@report.docx". The "@" is only
+included as a way of mentioning the doc. The actual name of the document would be "report.docx".
+If the document content is included in this prompt, you don't need to use an additional tool to read the document.
+To quote a whole passage from the context, write <cite id="PASSAGE_ID"/> instead of copying its text;
+it will be replaced with the passage.
+Answer the user's question directly and concisely. Start with the exact information they need.
+Don't refer to or mention the provided context in any way - just use it to inform your answer.
+"""
+
+
+class _CitationStream:
+    """Passes streamed text on with <cite/> tags expanded.
+
+    A tag can arrive split over several pieces, so text from an unclosed "<"
+    onwards is held back until the tag is complete (or clearly isn't one).
+    """
+
+    # Longer than any <cite id="..."/> tag we hand out
+    MAX_TAG_LENGTH = 256
+
+    def __init__(self, expand: Callable[[str], str], write: Callable[[str], None]):
+        self._expand = expand
+        self._write = write
+        self._pending = ""
+
+    def write(self, text: str):
+        self._pending += text
+        cut = self._pending.rfind("<")
+        if (
+            cut != -1
+            and ">" not in self._pending[cut:]
+            and len(self._pending) - cut < self.MAX_TAG_LENGTH
+        ):
+            ready, self._pending = self._pending[:cut], self._pending[cut:]
+        else:
+            ready, self._pending = self._pending, ""
+        if ready:
+            self._write(self._expand(ready))
+
+    def flush(self):
+        if self._pending:
+            self._write(self._expand(self._pending))
+            self._pending = ""
+
 
 class CliChat(Chat):
     def __init__(
@@ -16,15 +87,40 @@ class CliChat(Chat):
         super().__init__(clients=clients, bedrock_service=bedrock_service)
 
         self.doc_client: MCPClient = doc_client
+        # (expires at, value) pairs, see DOCS_CACHE_TTL
+        self._docs_ids_cache: Optional[tuple[float, list[str]]] = None
+        self._docs_cache: dict[str, tuple[float, str]] = {}
+        # Doc id -> its passages as last shown to the model; passage "doc#i"
+        # is self._passages[doc][i]
+        self._passages: dict[str, list[str]] = {}
 
     async def list_prompts(self) -> list[Prompt]:
         return await self.doc_client.list_prompts()
 
     async def list_docs_ids(self) -> list[str]:
-        return await self.doc_client.read_resource("docs://documents")
+        now = time.monotonic()
+        if self._docs_ids_cache and now < self._docs_ids_cache[0]:
+            return self._docs_ids_cache[1]
+
+        doc_ids = await self.doc_client.read_resource("docs://documents")
+        self._docs_ids_cache = (now + DOCS_CACHE_TTL, doc_ids)
+        return doc_ids
 
     async def get_doc_content(self, doc_id: str) -> str:
-        return await self.doc_client.read_resource(f"docs://documents/{doc_id}")
+        now = time.monotonic()
+        cached = self._docs_cache.get(doc_id)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        content = await self.doc_client.read_resource(
+            f"docs://documents/{doc_id}"
+        )
+        self._docs_cache[doc_id] = (now + DOCS_CACHE_TTL, content)
+        return content
+
+    def _tools_ran(self):
+        # A tool such as edit_document may have changed any document
+        self._docs_cache.clear()
 
     async def get_prompt(
         self, command: str, doc_id: str
@@ -32,21 +128,62 @@ class CliChat(Chat):
         return await self.doc_client.get_prompt(command, {"doc_id": doc_id})
 
     async def _extract_resources(self, query: str) -> str:
-        mentions = [word[1:] for word in query.split() if word.startswith("@")]
+        mentions = {word[1:] for word in query.split() if word.startswith("@")}
+        if not mentions:
+            return ""
 
         doc_ids = await self.list_docs_ids()
-        mentioned_docs: list[Tuple[str, str]] = []
+        wanted = [doc_id for doc_id in doc_ids if doc_id in mentions]
 
-        for doc_id in doc_ids:
-            if doc_id in mentions:
-                content = await self.get_doc_content(doc_id)
-                mentioned_docs.append((doc_id, content))
+        # Mentioned documents are read concurrently
+        contents = await asyncio.gather(
+            *(self.get_doc_content(doc_id) for doc_id in wanted)
+        )
 
         return "".join(
-            f'\n<document id="{doc_id}">\n{content}\n</document>\n'
-            for doc_id, content in mentioned_docs
+            f'\n<document id="{doc_id}">\n{self._to_passages(doc_id, content)}\n</document>\n'
+            for doc_id, content in zip(wanted, contents)
         )
 
+    def _to_passages(self, doc_id: str, content: str) -> str:
+        """Tags a document's paragraphs with citable ids.
+
+        The paragraphs keep the blank lines between them, so the model sees
+        the document's whitespace as edit_document will match it.
+        """
+        paragraphs = content.split("\n\n")
+        # Replaces the passages from any earlier read of this document
+        self._passages[doc_id] = paragraphs
+        return "\n\n".join(
+            f'<passage id="{doc_id}#{i}">{paragraph}</passage>'
+            for i, paragraph in enumerate(paragraphs)
+        )
+
+    def _passage(self, match: re.Match) -> str:
+        doc_id, _, index = match.group(1).rpartition("#")
+        paragraphs = self._passages.get(doc_id)
+        if paragraphs is None or not index.isdigit() or int(index) >= len(paragraphs):
+            return match.group(0)
+        return paragraphs[int(index)]
+
+    def expand_citations(self, text: str) -> str:
+        return _CITE.sub(self._passage, text)
+
+    async def run(
+        self, query: str, on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        # The history keeps the short <cite/> form; only the user sees the text
+        if on_text is None:
+            return self.expand_citations(await super().run(query))
+
+        stream = _CitationStream(self.expand_citations, on_text)
+        try:
+            return self.expand_citations(
+                await super().run(query, on_text=stream.write)
+            )
+        finally:
+            stream.flush()
+
     async def _process_command(self, query: str) -> bool:
         if not query.startswith("/"):
             return False
@@ -57,7 +194,7 @@ class CliChat(Chat):
         messages = await self.doc_client.get_prompt(
             command, {"doc_id": words[1]}
         )
-        self.messages += to_bedrock_messages(messages)
+        self.messages.extend(to_bedrock_messages(messages))
         return True
 
     async def _process_query(self, query: str):
@@ -66,22 +203,8 @@ class CliChat(Chat):
 
         added_resources = await self._extract_resources(query)
 
-        prompt = f"""
-        The user has a question:
-        <query>
-        {query}
-        </query>
-
-        The following context may be useful in answering their question:
-        <context>
-        {added_resources}
-        </context>
-
-        Note the user's query might contain references to documents like "@report.docx". The "@" is only
-        included as a way of mentioning the doc. The actual name of the document would be "report.docx".
-        If the document content is included in this prompt, you don't need to use an additional tool to read the document.
-        Answer the user's question directly and concisely. Start with the exact information they need. 
-        Don't refer to or mention the provided context in any way - just use it to inform your answer.
-        """
+        prompt = "".join(
+            (_PROMPT_PRE, query, _PROMPT_MID, added_resources, _PROMPT_POST)
+        )
 
         self.messages.append({"role": "user", "content": [{"text": prompt}]})
@@ -1,29 +1,59 @@
-import json
+import asyncio
 from typing import Optional, Any, Literal
 from mcp.types import CallToolResult, Tool, TextContent
 from mcp_client import MCPClient
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+
 
 class ToolManager:
-    @classmethod
-    async def get_all_tools(cls, clients: dict[str, MCPClient]) -> list[Tool]:
-        """Gets all tools from the provided clients."""
-        tools = []
+    """Runs tool requests against MCP clients.
+
+    Tool lists are fetched once per client and kept, together with a
+    tool name -> client map, until invalidate() is called (for example when a
+    server reports that its tool list changed).
+    """
+
+    def __init__(self):
+        self._tools_by_client: dict[MCPClient, list[Tool]] = {}
+        self._client_by_tool: dict[str, MCPClient] = {}
+
+    def invalidate(self):
+        """Drops the cached tool lists; they are fetched again on next use."""
+        self._tools_by_client.clear()
+        self._client_by_tool.clear()
+
+    async def _ensure_loaded(self, clients: dict[str, MCPClient]):
+        missing = [c for c in clients.values() if c not in self._tools_by_client]
+        if not missing:
+            return
+
+        tool_lists = await asyncio.gather(*(c.list_tools() for c in missing))
+        self._tools_by_client.update(zip(missing, tool_lists))
+
+        # Rebuilt in client order, so the first client with a tool keeps it
+        self._client_by_tool.clear()
         for client in clients.values():
-            tools += await client.list_tools()
-        return tools
+            for tool in self._tools_by_client.get(client, ()):
+                self._client_by_tool.setdefault(tool.name, client)
 
-    @classmethod
-    async def _find_client_with_tool(
-        cls, clients: list[MCPClient], tool_name: str
-    ) -> Optional[MCPClient]:
-        """Finds the first client that has the specified tool."""
-        for client in clients:
-            tools = await client.list_tools()
-            tool = next((t for t in tools if t.name == tool_name), None)
-            if tool:
-                return client
-        return None
+    async def get_all_tools(self, clients: dict[str, MCPClient]) -> list[Tool]:
+        """Gets all tools from the provided clients."""
+        await self._ensure_loaded(clients)
+        return [
+            tool
+            for client in clients.values()
+            for tool in self._tools_by_client[client]
+        ]
 
     @classmethod
     def _build_tool_result_part(
@@ -41,63 +71,67 @@ class ToolManager:
             }
         }
 
-    @classmethod
-    async def execute_tool_requests(
-        cls, clients: dict[str, MCPClient], parts: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        """Executes a list of tool requests against the provided clients."""
-        tool_requests = [part for part in parts if "toolUse" in part]
-        tool_result_parts = []
-        for tool_request in tool_requests:
-            tool_use = tool_request.get("toolUse")
-            if not tool_use:
-                continue
-
-            tool_use_id = tool_use.get("toolUseId")
-            tool_name = tool_use.get("name")
-            tool_input = tool_use.get("input", {})
-
-            client = await cls._find_client_with_tool(
-                list(clients.values()), tool_name
-            )
+    async def _execute_tool_request(
+        self, client: Optional[MCPClient], tool_use: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Runs one tool request on the client offering the tool."""
+        tool_use_id = tool_use.get("toolUseId")
+        tool_name = tool_use.get("name")
+        tool_input = tool_use.get("input", {})
 
-            if not client:
-                tool_result_part = cls._build_tool_result_part(
-                    tool_use_id, "Could not find that tool", "error"
-                )
-                tool_result_parts.append(tool_result_part)
-                continue
+        if not client:
+            return self._build_tool_result_part(
+                tool_use_id, "Could not find that tool", "error"
+            )
 
-            try:
-                tool_output: CallToolResult | None = await client.call_tool(
-                    tool_name, tool_input
-                )
-                items = []
-                if tool_output:
-                    items = tool_output.content
-                content_list = [
-                    item.text for item in items if isinstance(item, TextContent)
-                ]
-                content_json = json.dumps(content_list)
-                tool_result_part = cls._build_tool_result_part(
-                    tool_use_id,
-                    content_json,
-                    "error"
-                    if tool_output and tool_output.isError
-                    else "success",
-                )
-            except Exception as e:
-                error_message = f"Error executing tool '{tool_name}': {e}"
-                print(error_message)
-                tool_result_part = {
-                    "toolResult": {
-                        "toolUseId": tool_use_id,
-                        "content": [
-                            {"text": json.dumps({"error": error_message})}
-                        ],
-                        "status": "error",
-                    }
+        try:
+            tool_output: CallToolResult | None = await client.call_tool(
+                tool_name, tool_input
+            )
+            items = []
+            if tool_output:
+                items = tool_output.content
+            content_list = [
+                item.text for item in items if isinstance(item, TextContent)
+            ]
+            content_json = _dumps(content_list)
+            return self._build_tool_result_part(
+                tool_use_id,
+                content_json,
+                "error"
+                if tool_output and tool_output.isError
+                else "success",
+            )
+        except Exception as e:
+            error_message = f"Error executing tool '{tool_name}': {e}"
+            print(error_message)
+            return {
+                "toolResult": {
+                    "toolUseId": tool_use_id,
+                    "content": [
+                        {"text": _dumps({"error": error_message})}
+                    ],
+                    "status": "error",
                 }
+            }
 
-            tool_result_parts.append(tool_result_part)
-        return tool_result_parts
+    async def execute_tool_requests(
+        self, clients: dict[str, MCPClient], parts: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Executes a list of tool requests against the provided clients.
+
+        The requests run concurrently; results come back in request order.
+        """
+        tool_uses = [tool_use for part in parts if (tool_use := part.get("toolUse"))]
+        await self._ensure_loaded(clients)
+        tool_to_client = self._client_by_tool
+        return list(
+            await asyncio.gather(
+                *(
+                    self._execute_tool_request(
+                        tool_to_client.get(tool_use.get("name")), tool_use
+                    )
+                    for tool_use in tool_uses
+                )
+            )
+        )
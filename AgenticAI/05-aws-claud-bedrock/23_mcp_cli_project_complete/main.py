@@ -4,7 +4,7 @@ import os
 from dotenv import load_dotenv
 from contextlib import AsyncExitStack
 
-from mcp_client import MCPClient
+from mcp_client import MCPClient, connect_all
 from core.bedrock import Bedrock
 
 from core.cli_chat import CliChat
@@ -16,6 +16,10 @@ load_dotenv()
 bedrock_region = os.getenv("BEDROCK_REGION", "")
 bedrock_model_id = os.getenv("BEDROCK_MODEL_ID", "")
 aws_profile = os.getenv("AWS_PROFILE", "default") 
+# "optimized" enables Bedrock latency-optimized inference on supported models
+bedrock_latency = os.getenv("BEDROCK_LATENCY", "standard")
+# Set to 0 for models without prompt caching support
+bedrock_prompt_caching = os.getenv("BEDROCK_PROMPT_CACHING", "1") == "1"
 
 assert bedrock_region, "Error: bedrock_region cannot be empty. Update .env"
 assert bedrock_model_id, "Error: bedrock_model_id cannot be empty. Update .env"
@@ -23,7 +27,11 @@ assert bedrock_model_id, "Error: bedrock_model_id cannot be empty. Update .env"
 
 async def main():
     bedrock_service = Bedrock(
-        region_name=bedrock_region, model_id=bedrock_model_id, profile_name=aws_profile 
+        region_name=bedrock_region,
+        model_id=bedrock_model_id,
+        profile_name=aws_profile,
+        latency=bedrock_latency,
+        prompt_caching=bedrock_prompt_caching,
     )
 
     server_scripts = sys.argv[1:]
@@ -35,18 +43,18 @@ async def main():
         else ("python", ["mcp_server.py"])
     )
 
+    doc_client = MCPClient(command=command, args=args)
+    clients["doc_client"] = doc_client
+
+    for i, server_script in enumerate(server_scripts):
+        client_id = f"client_{i}_{server_script}"
+        clients[client_id] = MCPClient(command="uv", args=["run", server_script])
+
     async with AsyncExitStack() as stack:
-        doc_client = await stack.enter_async_context(
-            MCPClient(command=command, args=args)
-        )
-        clients["doc_client"] = doc_client
+        stack.push_async_callback(bedrock_service.aclose)
 
-        for i, server_script in enumerate(server_scripts):
-            client_id = f"client_{i}_{server_script}"
-            client = await stack.enter_async_context(
-                MCPClient(command="uv", args=["run", server_script])
-            )
-            clients[client_id] = client
+        # All MCP servers start and handshake at the same time
+        await stack.enter_async_context(connect_all(list(clients.values())))
 
         chat = CliChat(
             doc_client=doc_client,
@@ -62,4 +70,13 @@ async def main():
 if __name__ == "__main__":
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        # uvloop's event loop has lower per-callback overhead, which every MCP
+        # message and streamed Bedrock chunk goes through
+        try:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     asyncio.run(main())
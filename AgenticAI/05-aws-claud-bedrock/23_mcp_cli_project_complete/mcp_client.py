@@ -2,8 +2,8 @@ import sys
 import asyncio
 import json
 from pydantic import AnyUrl
-from typing import Optional, Any
-from contextlib import AsyncExitStack
+from typing import Optional, Any, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 
@@ -20,6 +20,18 @@ class MCPClient:
         self._env = env
         self._session: Optional[ClientSession] = None
         self._exit_stack: AsyncExitStack = AsyncExitStack()
+        self._tools_changed_listeners: list[Callable[[], None]] = []
+
+    def add_tools_changed_listener(self, listener: Callable[[], None]):
+        """Registers a callback run when the server says its tool list changed."""
+        self._tools_changed_listeners.append(listener)
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            for listener in self._tools_changed_listeners:
+                listener()
 
     async def connect(self):
         server_params = StdioServerParameters(
@@ -32,7 +44,7 @@ class MCPClient:
         )
         _stdio, _write = stdio_transport
         self._session = await self._exit_stack.enter_async_context(
-            ClientSession(_stdio, _write)
+            ClientSession(_stdio, _write, message_handler=self._handle_message)
         )
         await self._session.initialize()
 
@@ -82,6 +94,41 @@ class MCPClient:
         await self.cleanup()
 
 
+@asynccontextmanager
+async def connect_all(clients: list[MCPClient]):
+    """Connects the clients concurrently and disconnects them on exit.
+
+    Starting a server and completing its handshake takes a while, so the
+    clients connect in parallel. The stdio transport runs on anyio, which
+    requires a client to be closed by the same task that opened it. Each
+    client is therefore held open by its own task until the block exits.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    connected = [loop.create_future() for _ in clients]
+
+    async def hold(client: MCPClient, ready: asyncio.Future):
+        try:
+            async with client:
+                ready.set_result(None)
+                await stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            raise
+
+    tasks = [
+        asyncio.create_task(hold(client, ready))
+        for client, ready in zip(clients, connected)
+    ]
+    try:
+        await asyncio.gather(*connected)
+        yield clients
+    finally:
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 # For testing
 async def main():
     async with MCPClient(